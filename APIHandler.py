@@ -1,7 +1,10 @@
 import requests
 import logging
+import time
 import streamlit as st
 
+from Cassette import Cassette, available_path, payload_size, scrub
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -11,15 +14,34 @@ class APIHandler:
     Handles API requests and responses for the HR Agent application.
     """
 
-    def __init__(self, api_url, bearer_token):
+    def __init__(self, api_url, bearer_token, cassette_mode=None, cassette_path=None, latency_scale=1.0,
+                 cassette_overwrite=False):
         """
         Initialize the APIHandler with API configuration.
 
         :param api_url: The URL of the API endpoint
         :param bearer_token: The bearer token for authentication
+        :param cassette_mode: "record" to capture backend sessions, "replay" to serve them back, None for live only
+        :param cassette_path: Location of the cassette file used in record or replay mode
+        :param latency_scale: Multiplier applied to recorded latencies in replay mode (0 disables waiting)
+        :param cassette_overwrite: Overwrite an existing cassette in record mode instead of rolling to a new path
         """
         self.api_url = api_url
         self.bearer_token = bearer_token
+        self.cassette_mode = cassette_mode
+        self.cassette_path = cassette_path
+        self.latency_scale = latency_scale
+        self.cassette_overwrite = cassette_overwrite
+
+    def start_flow(self):
+        """
+        Start a new prompt -> approval -> continuation flow.
+
+        In record mode the next request opens a new cassette; in replay mode
+        the cassette is served again from the beginning.
+        """
+        st.session_state.cassette_cursor = 0
+        st.session_state.cassette_active_path = None
 
     def make_request(self, data):
         """
@@ -31,21 +53,86 @@ class APIHandler:
         # Uncomment to use mock data for testing
         # return self._mock_response(data)
         #
+        if self.cassette_mode == "replay":
+            return self._replay_response(data)
+
         headers = {
             "Authorization": f"Bearer {self.bearer_token}",
             "Content-Type": "application/json"
         }
 
+        start = time.perf_counter()
         try:
             with st.spinner("Processing your request..."):
                 response = requests.post(self.api_url, headers=headers, json=data)
                 response.raise_for_status()
-                return response.json()
+                response_json = response.json()
+                if self.cassette_mode == "record":
+                    self._record_interaction(data, response_json, time.perf_counter() - start)
+                return response_json
         except requests.exceptions.RequestException as e:
             logger.info(f"API request: {data}")
+            if self.cassette_mode == "record":
+                self._record_interaction(data, None, time.perf_counter() - start, str(e))
             st.error(f"API Error: {str(e)}")
             return None
 
+    def _record_interaction(self, data, response, latency, error=None):
+        """
+        Append a request/response pair to the cassette for the current flow.
+
+        The first request of a flow opens a new cassette, so one cassette holds
+        one prompt -> approval -> continuation flow. An existing recording at
+        cassette_path is kept and the flow rolls to an indexed path instead,
+        unless cassette_overwrite is set.
+
+        :param data: The data sent to the API
+        :param response: The API response as JSON, or None if the request failed
+        :param latency: Time taken by the backend in seconds
+        :param error: Error message if the request failed
+        """
+        cursor = st.session_state.get("cassette_cursor", 0)
+        path = st.session_state.get("cassette_active_path")
+        if cursor == 0 or not path:
+            path = self.cassette_path if self.cassette_overwrite else available_path(self.cassette_path)
+            st.session_state.cassette_active_path = path
+            cassette = Cassette(path)
+            logger.info(f"Recording backend session to {path}")
+        else:
+            cassette = Cassette.load(path)
+        cassette.record(data, response, latency, secrets=(self.bearer_token,), error=error)
+        cassette.save()
+        st.session_state.cassette_cursor = cursor + 1
+
+    def _replay_response(self, data):
+        """
+        Serve the next recorded response from the cassette instead of calling the API.
+
+        :param data: The data that would have been sent to the API
+        :return: The recorded API response, or None if the recorded request failed
+        """
+        cursor = st.session_state.get("cassette_cursor", 0)
+        interaction = Cassette.load(self.cassette_path).get(cursor)
+        if interaction is None:
+            st.error("API Error: cassette exhausted, no recorded response left to replay")
+            return None
+
+        st.session_state.cassette_cursor = cursor + 1
+        stats = st.session_state.setdefault("cassette_stats", {"requests": 0, "payload_bytes": 0, "diverged": 0})
+        stats["requests"] += 1
+        if scrub(data, (self.bearer_token,)) != interaction["request"]:
+            logger.warning(f"Replayed request {cursor} differs from the recorded request")
+            stats["diverged"] = stats.get("diverged", 0) + 1
+        stats["payload_bytes"] += payload_size(data) + interaction["response_bytes"]
+
+        with st.spinner("Processing your request..."):
+            time.sleep(interaction["latency"] * self.latency_scale)
+
+        if interaction.get("error"):
+            st.error(f"API Error: {interaction['error']}")
+            return None
+        return interaction["response"]
+
     def _mock_response(self, data):
         """
         Return mock response data for testing.
@@ -4,11 +4,13 @@ import copy
 import logging
 from pyarrow import null
 import os
+import uuid
 from dotenv import load_dotenv
 
 from ResponseHandler import ResponseHandler
 from UIComponents import UIComponents
 from APIHandler import APIHandler
+from Profiler import RerunProfiler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,12 +22,30 @@ load_dotenv()
 API_URL = os.getenv("API_URL")
 BEARER_TOKEN = os.getenv("BEARER_TOKEN")
 
-if not API_URL or not BEARER_TOKEN:
+# Optional record/replay of backend sessions ("record" or "replay")
+CASSETTE_MODE = os.getenv("CASSETTE_MODE") or None
+CASSETTE_PATH = os.getenv("CASSETTE_PATH", "cassettes/session.json")
+CASSETTE_LATENCY_SCALE = float(os.getenv("CASSETTE_LATENCY_SCALE", "1.0"))
+CASSETTE_OVERWRITE = os.getenv("CASSETTE_OVERWRITE", "").lower() in ("1", "true", "yes")
+
+# Optional profiling of slow reruns
+PROFILE_RERUNS = os.getenv("PROFILE_RERUNS", "").lower() in ("1", "true", "yes")
+PROFILE_ADMIN_KEY = os.getenv("PROFILE_ADMIN_KEY")
+
+if CASSETTE_MODE != "replay" and (not API_URL or not BEARER_TOKEN):
     logger.error(".env file not found or missing required variables. Please create it from .env.example")
     st.error("Environment configuration missing. Please create .env file from .env.example")
 
 # Initialize API handler
-api_handler = APIHandler(API_URL, BEARER_TOKEN)
+api_handler = APIHandler(API_URL, BEARER_TOKEN, CASSETTE_MODE, CASSETTE_PATH, CASSETTE_LATENCY_SCALE,
+                         CASSETTE_OVERWRITE)
+
+# Initialize rerun profiler
+rerun_profiler = RerunProfiler(
+    os.getenv("PROFILE_DIR", "profiles"),
+    float(os.getenv("PROFILE_THRESHOLD_MS", "500")),
+    int(os.getenv("PROFILE_MAX_FILES", "50"))
+)
 
 
 def initialize_session_state():
@@ -55,6 +75,12 @@ def initialize_session_state():
         st.session_state.request_history = []
     if "processed_requests" not in st.session_state:
         st.session_state.processed_requests = set()
+    if "script_runs" not in st.session_state:
+        st.session_state.script_runs = 0
+    if "approval_round" not in st.session_state:
+        st.session_state.approval_round = 0
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
 
 
 def make_api_request(data):
@@ -132,6 +158,11 @@ def display_sidebar_content():
         # Display request history in the sidebar
         UIComponents.display_request_history()
 
+        # Display slow rerun summary when profiling is enabled
+        if profiling_enabled():
+            st.markdown("---")
+            UIComponents.display_profile_summary(rerun_profiler.recent_reruns(), rerun_profiler.hot_functions())
+
 
 def handle_resume_requests():
     """
@@ -153,6 +184,10 @@ def handle_chat_input():
         with st.chat_message("user"):
             st.write(prompt)
 
+        # A new prompt starts a new approval flow
+        st.session_state.approval_round = 0
+        api_handler.start_flow()
+
         # Format the request with messages array
         request_data = {"prompt": prompt}
 
@@ -174,6 +209,54 @@ def handle_chat_input():
                     st.write(processed_response)
 
 
+def profiling_enabled():
+    """
+    Check if reruns should be profiled, either via PROFILE_RERUNS or the admin query parameter.
+
+    :return: True if profiling is enabled, False otherwise
+    """
+    if PROFILE_RERUNS:
+        return True
+    return bool(PROFILE_ADMIN_KEY) and st.query_params.get("profile") == PROFILE_ADMIN_KEY
+
+
+def current_phase():
+    """
+    Determine which phase of the app the current rerun renders.
+
+    :return: "welcome", "resume request" or "chat"
+    """
+    if st.session_state.get("show_welcome", True):
+        return "welcome"
+    if st.session_state.get("showing_resume_request"):
+        return "resume request"
+    return "chat"
+
+
+def run():
+    """
+    Run the app, profiling the rerun if profiling is enabled.
+    """
+    if not profiling_enabled():
+        main()
+        return
+
+    initialize_session_state()
+    # The phase is the one the rerun started in; the approval round and run
+    # number are read after the rerun, so they include a submission it made
+    phase = current_phase()
+
+    def get_tags():
+        return {
+            "session": st.session_state.session_id,
+            "phase": phase,
+            "approval_round": st.session_state.approval_round,
+            "script_run": st.session_state.script_runs
+        }
+
+    rerun_profiler.run(main, get_tags)
+
+
 def main():
     """
     Main function to run the HR Agent application.
@@ -181,6 +264,7 @@ def main():
     st.title("🎯 Welcome to BriefMe Brilliantly!")
 
     initialize_session_state()
+    st.session_state.script_runs += 1
 
     # Display sidebar content
     display_sidebar_content()
@@ -198,4 +282,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run()
\ No newline at end of file
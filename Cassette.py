@@ -0,0 +1,141 @@
+import json
+import os
+import datetime
+
+SCRUBBED = "<SCRUBBED>"
+SENSITIVE_KEYS = {"authorization", "token", "bearer_token", "access_token", "api_key", "password", "secret"}
+
+
+class Cassette:
+    """
+    A recording of request/response pairs exchanged with the backend.
+
+    Cassettes are stored as compact JSON so that a full prompt -> approval ->
+    continuation session can be replayed without the live backend.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, interactions=None, recorded_at=None):
+        """
+        Initialize the Cassette.
+
+        :param path: Location of the cassette file
+        :param interactions: List of recorded interactions
+        :param recorded_at: Timestamp of when the recording started
+        """
+        self.path = path
+        self.interactions = interactions if interactions is not None else []
+        self.recorded_at = recorded_at or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a cassette from disk.
+
+        :param path: Location of the cassette file
+        :return: Cassette instance
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return cls(path, data.get("interactions", []), data.get("recorded_at"))
+
+    def save(self):
+        """
+        Write the cassette to disk.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "version": self.VERSION,
+            "recorded_at": self.recorded_at,
+            "interactions": self.interactions
+        }
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    def record(self, request, response, latency, secrets=(), error=None):
+        """
+        Append an interaction to the cassette with secrets scrubbed.
+
+        :param request: The data sent to the API
+        :param response: The JSON response from the API, or None if the request failed
+        :param latency: Time taken by the backend in seconds
+        :param secrets: Literal values (e.g. the bearer token) to remove from the payloads
+        :param error: Error message if the request failed
+        """
+        request = scrub(request, secrets)
+        response = scrub(response, secrets)
+        interaction = {
+            "request": request,
+            "response": response,
+            "latency": round(latency, 4),
+            "request_bytes": payload_size(request),
+            "response_bytes": payload_size(response)
+        }
+        if error:
+            interaction["error"] = scrub(error, secrets)
+        self.interactions.append(interaction)
+
+    def get(self, index):
+        """
+        Get a recorded interaction by position.
+
+        :param index: Position of the interaction in the cassette
+        :return: The interaction dict, or None if the cassette is exhausted
+        """
+        if 0 <= index < len(self.interactions):
+            return self.interactions[index]
+        return None
+
+
+def available_path(path):
+    """
+    Find a cassette path that does not clobber an existing recording.
+
+    :param path: Preferred location of the cassette file
+    :return: path if it is free, otherwise the first free indexed variant (e.g. session-1.json)
+    """
+    if not os.path.exists(path):
+        return path
+    base, extension = os.path.splitext(path)
+    index = 1
+    while os.path.exists(f"{base}-{index}{extension}"):
+        index += 1
+    return f"{base}-{index}{extension}"
+
+
+def payload_size(data):
+    """
+    Size in bytes of the compact JSON encoding of a payload.
+
+    :param data: JSON-serializable payload
+    :return: Number of bytes
+    """
+    if data is None:
+        return 0
+    return len(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+
+def scrub(data, secrets=()):
+    """
+    Remove credentials from a payload before it is written to a cassette.
+
+    :param data: JSON-serializable payload
+    :param secrets: Literal values to replace wherever they appear
+    :return: A scrubbed copy of the payload
+    """
+    if isinstance(data, dict):
+        return {
+            key: SCRUBBED if str(key).lower() in SENSITIVE_KEYS else scrub(value, secrets)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [scrub(item, secrets) for item in data]
+    if isinstance(data, str):
+        for secret in secrets:
+            if secret:
+                data = data.replace(secret, SCRUBBED)
+        return data
+    return data
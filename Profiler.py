@@ -0,0 +1,158 @@
+import cProfile
+import pstats
+import glob
+import json
+import os
+import time
+import datetime
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# cProfile is interpreter-wide on Python 3.12+, so only one rerun is profiled at a time
+_profile_lock = threading.Lock()
+
+
+class RerunProfiler:
+    """
+    Profiles script reruns and keeps the ones slower than a latency threshold.
+
+    Each kept rerun is written to the profile directory as a cProfile dump with
+    a JSON sidecar holding its tags (session, phase, approval round, duration).
+    Only the newest max_files profiles are kept.
+
+    Reruns from different sessions run in different threads; while one rerun
+    is being profiled, concurrent reruns run unprofiled.
+    """
+
+    def __init__(self, profile_dir="profiles", threshold_ms=500, max_files=50):
+        """
+        Initialize the RerunProfiler.
+
+        :param profile_dir: Directory where slow rerun profiles are written
+        :param threshold_ms: Reruns faster than this are discarded
+        :param max_files: Maximum number of profiles kept in the directory
+        """
+        self.profile_dir = profile_dir
+        self.threshold_ms = threshold_ms
+        self.max_files = max_files
+
+    def run(self, func, get_tags):
+        """
+        Run a function under the profiler and keep the profile if it was slow.
+
+        Exceptions (including Streamlit's rerun signal) are re-raised after
+        the profile has been handled. If another rerun is already being
+        profiled, func runs without profiling.
+
+        :param func: The function to profile, called without arguments
+        :param get_tags: Function returning a dictionary of tags describing the rerun,
+            called after func returns or raises so the tags reflect the finished rerun
+        :return: The return value of func
+        """
+        if not _profile_lock.acquire(blocking=False):
+            return func()
+        try:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                logger.warning(f"Rerun not profiled: {str(e)}")
+                return func()
+
+            start = time.perf_counter()
+            try:
+                return func()
+            finally:
+                profile.disable()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if elapsed_ms >= self.threshold_ms:
+                    self._save(profile, dict(get_tags(), duration_ms=round(elapsed_ms, 1)))
+        finally:
+            _profile_lock.release()
+
+    def _save(self, profile, tags):
+        """
+        Write a profile and its tags to the profile directory and rotate old ones.
+
+        :param profile: The finished cProfile.Profile
+        :param tags: Dictionary of tags describing the rerun
+        """
+        os.makedirs(self.profile_dir, exist_ok=True)
+        timestamp = datetime.datetime.now()
+        tags["timestamp"] = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        name = f"{timestamp.strftime('%Y%m%d-%H%M%S-%f')}_{tags.get('session', 'unknown')[:8]}_{tags.get('phase', 'unknown')}"
+        base = os.path.join(self.profile_dir, name.replace(" ", "_"))
+        try:
+            profile.dump_stats(f"{base}.prof")
+            with open(f"{base}.json", "w", encoding="utf-8") as file:
+                json.dump(tags, file)
+        except OSError as e:
+            logger.warning(f"Could not write profile {base}: {str(e)}")
+            return
+        logger.info(f"Slow rerun profiled ({tags['duration_ms']} ms): {base}.prof")
+        self._rotate()
+
+    def _profile_files(self):
+        """
+        List the profile dumps in the profile directory, oldest first.
+
+        :return: List of .prof file paths
+        """
+        return sorted(glob.glob(os.path.join(self.profile_dir, "*.prof")))
+
+    def _rotate(self):
+        """
+        Delete the oldest profiles beyond max_files.
+        """
+        files = self._profile_files()
+        for path in files[:max(len(files) - self.max_files, 0)]:
+            for stale in (path, f"{path[:-len('.prof')]}.json"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    def recent_reruns(self, limit=10):
+        """
+        Get the tags of the most recent slow reruns.
+
+        :param limit: Maximum number of reruns to return
+        :return: List of tag dictionaries, newest first
+        """
+        reruns = []
+        for path in reversed(self._profile_files()[-limit:]):
+            try:
+                with open(f"{path[:-len('.prof')]}.json", "r", encoding="utf-8") as file:
+                    reruns.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+        return reruns
+
+    def hot_functions(self, limit=10, recent=20):
+        """
+        Aggregate the most expensive functions across recent slow reruns.
+
+        :param limit: Number of functions to return
+        :param recent: Number of most recent profiles to aggregate
+        :return: List of dicts with function, calls, own time and cumulative time, most expensive first
+        """
+        files = self._profile_files()[-recent:]
+        if not files:
+            return []
+        stats = pstats.Stats()
+        for path in files:
+            # Skip files that are half-written, corrupt or rotated away by another session
+            try:
+                stats.add(path)
+            except (OSError, EOFError, ValueError, TypeError):
+                continue
+        rows = []
+        for (filename, line, function), (_, calls, own_time, cumulative_time, _) in stats.stats.items():
+            rows.append({
+                "function": f"{function} ({os.path.basename(filename)}:{line})",
+                "calls": calls,
+                "own_ms": round(own_time * 1000, 1),
+                "cumulative_ms": round(cumulative_time * 1000, 1)
+            })
+        rows.sort(key=lambda row: row["own_ms"], reverse=True)
+        return rows[:limit]
@@ -138,6 +138,9 @@ class UIComponents:
                     approval_indices[i] = j
                     break
 
+        # Each submission starts a new approval round
+        st.session_state.approval_round = st.session_state.get("approval_round", 0) + 1
+
         # Process all selected approvals
         for i in range(len(approval_info)):
             metadata_text = None
@@ -371,4 +374,30 @@ class UIComponents:
         if st.session_state.request_history:
             st.header("Approval & Status Update History")
             for i, history_item in enumerate(st.session_state.request_history):
-                UIComponents.display_history_item(history_item, i)
\ No newline at end of file
+                UIComponents.display_history_item(history_item, i)
+
+    @staticmethod
+    def display_profile_summary(recent_reruns, hot_functions):
+        """
+        Display a summary of recent slow reruns in the sidebar.
+
+        :param recent_reruns: List of tag dictionaries of recent slow reruns
+        :param hot_functions: List of the most expensive functions across those reruns
+        """
+        with st.expander("⏱️ Slow Reruns", expanded=False):
+            if not recent_reruns:
+                st.write("No slow reruns recorded yet.")
+                return
+            st.markdown("**Recent slow reruns:**")
+            st.table([
+                {
+                    "time": rerun.get("timestamp"),
+                    "phase": rerun.get("phase"),
+                    "round": rerun.get("approval_round"),
+                    "ms": rerun.get("duration_ms"),
+                    "session": rerun.get("session", "")[:8]
+                }
+                for rerun in recent_reruns
+            ])
+            st.markdown("**Top hot functions:**")
+            st.table(hot_functions)
@@ -0,0 +1,223 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from Cassette import Cassette
+
+APP_FILE = "Briefing_Agent.py"
+BASELINE_FILE = "baseline.json"
+METRICS = ("render_time", "reruns", "payload_bytes")
+
+
+class ReplayError(Exception):
+    """
+    Raised when a cassette cannot be replayed through the app.
+    """
+
+
+def run_app(at, timings):
+    """
+    Run the app once and record how long the run took.
+
+    :param at: AppTest instance
+    :param timings: List collecting the duration of every run
+    :raises ReplayError: If the app raised an exception during the run
+    """
+    start = time.perf_counter()
+    at.run()
+    timings.append(time.perf_counter() - start)
+    if at.exception:
+        raise ReplayError(f"app raised {at.exception[0].value}")
+
+
+def click_button(at, label=None, key=None):
+    """
+    Click a rendered button by label or key.
+
+    :param at: AppTest instance
+    :param label: Button label to match
+    :param key: Button key to match
+    :raises ReplayError: If the button is not rendered
+    """
+    button = find_button(at, label=label, key=key)
+    if button is None:
+        raise ReplayError(f"button {label or key!r} not found")
+    button.click()
+
+
+def find_button(at, label=None, key=None):
+    """
+    Find a rendered button by label or key.
+
+    :param at: AppTest instance
+    :param label: Button label to match
+    :param key: Button key to match
+    :return: The button element, or None if it is not rendered
+    """
+    for button in at.button:
+        if (label is not None and button.label == label) or (key is not None and button.key == key):
+            return button
+    return None
+
+
+def session_value(at, key, default):
+    """
+    Read a value from the app's session state.
+
+    :param at: AppTest instance
+    :param key: Session state key
+    :param default: Value returned if the key is not set
+    :return: The session state value, or default
+    """
+    try:
+        return at.session_state[key]
+    except KeyError:
+        return default
+
+
+def replay_cassette(path, latency_scale, timeout):
+    """
+    Replay a cassette through the prompt -> approval -> continuation flow.
+
+    :param path: Location of the cassette file
+    :param latency_scale: Multiplier applied to recorded latencies
+    :param timeout: Maximum seconds allowed for a single app run
+    :return: Dictionary of measured metrics
+    :raises ReplayError: If the cassette cannot be replayed
+    """
+    cassette = Cassette.load(path)
+    first_request = cassette.get(0)
+    if first_request is None or not isinstance(first_request.get("request"), dict) \
+            or "prompt" not in first_request["request"]:
+        raise ReplayError("cassette does not start with a prompt request")
+
+    os.environ["CASSETTE_MODE"] = "replay"
+    os.environ["CASSETTE_PATH"] = path
+    os.environ["CASSETTE_LATENCY_SCALE"] = str(latency_scale)
+    os.environ.setdefault("API_URL", "replay")
+    os.environ.setdefault("BEARER_TOKEN", "replay")
+
+    timings = []
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+    run_app(at, timings)
+
+    # Leave the welcome screen and send the recorded prompt
+    click_button(at, label="Let's Get Started!")
+    run_app(at, timings)
+    if not at.chat_input:
+        raise ReplayError("chat input not found")
+    at.chat_input[0].set_value(first_request["request"]["prompt"])
+    run_app(at, timings)
+
+    # Approve every pending request until the recorded session is exhausted
+    while session_value(at, "cassette_cursor", 0) < len(cassette.interactions):
+        if find_button(at, key="approve") is None:
+            break
+        click_button(at, key="approve")
+        run_app(at, timings)
+
+    # A replay that stops early or sends different requests is a failure, not a smaller measurement
+    cursor = session_value(at, "cassette_cursor", 0)
+    if cursor < len(cassette.interactions):
+        raise ReplayError(f"replay stopped after {cursor} of {len(cassette.interactions)} interactions")
+    stats = session_value(at, "cassette_stats", {"requests": 0, "payload_bytes": 0, "diverged": 0})
+    if stats["requests"] != len(cassette.interactions):
+        raise ReplayError(f"app sent {stats['requests']} requests, cassette has {len(cassette.interactions)}")
+    if stats.get("diverged", 0):
+        raise ReplayError(f"{stats['diverged']} requests differ from the recorded requests")
+    return {
+        "render_time": round(sum(timings), 4),
+        "reruns": session_value(at, "script_runs", 0),
+        "payload_bytes": stats["payload_bytes"],
+        "requests": stats["requests"]
+    }
+
+
+def find_regressions(name, metrics, baseline, threshold):
+    """
+    Compare measured metrics against the baseline for a cassette.
+
+    :param name: Cassette file name
+    :param metrics: Measured metrics
+    :param baseline: Baseline metrics, or None if the cassette has no baseline yet
+        (reported separately as a missing baseline)
+    :param threshold: Allowed relative increase (0.2 means 20%)
+    :return: List of regression messages
+    """
+    if not baseline:
+        return []
+    regressions = []
+    for metric in METRICS:
+        limit = baseline[metric] * (1 + threshold)
+        if metrics[metric] > limit:
+            regressions.append(f"{name}: {metric} {metrics[metric]} exceeds baseline {baseline[metric]} "
+                               f"by more than {threshold:.0%}")
+    return regressions
+
+
+def main():
+    """
+    Replay a library of cassettes and fail if render time, rerun count or payload size regress.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("cassette_dir", nargs="?", default="cassettes", help="Directory containing cassette files")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative increase over the baseline")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="Multiplier applied to recorded backend latencies (0 measures rendering only)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Maximum seconds for a single app run")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the measured metrics as the new baseline")
+    args = parser.parse_args()
+
+    baseline_path = os.path.join(args.cassette_dir, BASELINE_FILE)
+    baselines = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r", encoding="utf-8") as file:
+            baselines = json.load(file)
+
+    paths = sorted(path for path in glob.glob(os.path.join(args.cassette_dir, "*.json"))
+                   if os.path.basename(path) != BASELINE_FILE)
+    if not paths:
+        print(f"No cassettes found in {args.cassette_dir}")
+        return 1
+
+    regressions = []
+    failures = []
+    missing = []
+    for path in paths:
+        name = os.path.basename(path)
+        try:
+            metrics = replay_cassette(path, args.latency_scale, args.timeout)
+        except (ReplayError, OSError, KeyError, ValueError, RuntimeError) as e:
+            failures.append(f"{name}: {str(e)}")
+            continue
+        print(f"{name}: render_time={metrics['render_time']}s reruns={metrics['reruns']} "
+              f"payload_bytes={metrics['payload_bytes']} requests={metrics['requests']}")
+        if name not in baselines:
+            missing.append(name)
+        regressions.extend(find_regressions(name, metrics, baselines.get(name), args.threshold))
+        if args.update_baseline:
+            baselines[name] = {metric: metrics[metric] for metric in METRICS}
+
+    for failure in failures:
+        print(f"FAILED {failure}")
+
+    if args.update_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as file:
+            json.dump(baselines, file, indent=2)
+        print(f"Baseline written to {baseline_path}")
+        return 1 if failures else 0
+
+    for name in missing:
+        print(f"MISSING BASELINE {name}")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions or failures or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import json
+import os
+
+from Cassette import Cassette, SCRUBBED, available_path, payload_size, scrub
+
+TOKEN = "secret-bearer-token"
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cassettes")
+
+
+def test_scrub_removes_nested_sensitive_keys():
+    data = [{"continuation": {"status": "pending", "Token": "abc"}, "headers": {"Authorization": "Bearer abc"}}]
+
+    scrubbed = scrub(data)
+
+    assert scrubbed[0]["continuation"] == {"status": "pending", "Token": SCRUBBED}
+    assert scrubbed[0]["headers"] == {"Authorization": SCRUBBED}
+    assert data[0]["continuation"]["Token"] == "abc"
+
+
+def test_scrub_keeps_keys_that_only_contain_a_sensitive_word():
+    data = {"max_tokens": 100, "usage": {"tokens_used": 42}}
+
+    assert scrub(data) == data
+
+
+def test_scrub_replaces_literal_secrets_in_strings():
+    data = {"messages": [{"content": f"called with {TOKEN} twice: {TOKEN}"}], "count": 2, "done": None}
+
+    scrubbed = scrub(data, (TOKEN,))
+
+    assert scrubbed["messages"][0]["content"] == f"called with {SCRUBBED} twice: {SCRUBBED}"
+    assert scrubbed["count"] == 2
+    assert scrubbed["done"] is None
+
+
+def test_scrub_ignores_empty_secrets():
+    assert scrub("unchanged", ("", None)) == "unchanged"
+
+
+def test_payload_size_is_compact_json_bytes():
+    assert payload_size(None) == 0
+    assert payload_size({"a": [1, 2]}) == len('{"a":[1,2]}')
+    assert payload_size({"name": "é"}) == len('{"name":"\\u00e9"}')
+
+
+def test_record_scrubs_and_measures_payloads():
+    cassette = Cassette("unused.json")
+
+    cassette.record({"prompt": f"use {TOKEN}"}, [{"token": TOKEN}], 1.23456, secrets=(TOKEN,))
+    cassette.record({"prompt": "fail"}, None, 0.5, secrets=(TOKEN,), error=f"401 for {TOKEN}")
+
+    first, second = cassette.interactions
+    assert first["request"] == {"prompt": f"use {SCRUBBED}"}
+    assert first["response"] == [{"token": SCRUBBED}]
+    assert first["latency"] == 1.2346
+    assert first["request_bytes"] == payload_size(first["request"])
+    assert first["response_bytes"] == payload_size(first["response"])
+    assert second["response"] is None
+    assert second["response_bytes"] == 0
+    assert second["error"] == f"401 for {SCRUBBED}"
+    assert TOKEN not in json.dumps(cassette.interactions)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "nested" / "session.json"
+    cassette = Cassette(str(path), recorded_at="2026-10-19 10:00:00")
+    cassette.record({"prompt": "hello"}, [{"messages": []}], 0.1, secrets=(TOKEN,))
+
+    cassette.save()
+    loaded = Cassette.load(str(path))
+
+    assert loaded.path == str(path)
+    assert loaded.recorded_at == "2026-10-19 10:00:00"
+    assert loaded.interactions == cassette.interactions
+    assert "\n" not in path.read_text(encoding="utf-8")
+    assert TOKEN not in path.read_text(encoding="utf-8")
+
+
+def test_get_past_the_end_returns_none():
+    cassette = Cassette("unused.json")
+    cassette.record({"prompt": "hello"}, [], 0.1)
+
+    assert cassette.get(0)["request"] == {"prompt": "hello"}
+    assert cassette.get(1) is None
+    assert cassette.get(-1) is None
+
+
+def test_available_path_does_not_clobber_recordings(tmp_path):
+    path = tmp_path / "session.json"
+    assert available_path(str(path)) == str(path)
+
+    path.write_text("{}")
+    (tmp_path / "session-1.json").write_text("{}")
+
+    assert available_path(str(path)) == str(tmp_path / "session-2.json")
+
+
+def test_sample_cassette_is_scrubbed_and_matches_baseline():
+    cassette = Cassette.load(os.path.join(CASSETTE_DIR, "sample_search_approval.json"))
+    with open(os.path.join(CASSETTE_DIR, "baseline.json"), "r", encoding="utf-8") as file:
+        baseline = json.load(file)["sample_search_approval.json"]
+
+    assert "prompt" in cassette.get(0)["request"]
+    for interaction in cassette.interactions:
+        assert scrub(interaction["request"]) == interaction["request"]
+        assert scrub(interaction["response"]) == interaction["response"]
+    recorded_bytes = sum(i["request_bytes"] + i["response_bytes"] for i in cassette.interactions)
+    assert recorded_bytes == baseline["payload_bytes"]
@@ -0,0 +1,88 @@
+import Profiler
+from Profiler import RerunProfiler
+
+
+def busy():
+    return sum(i * i for i in range(20000))
+
+
+def test_slow_rerun_is_kept_with_tags_read_after_the_rerun(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), threshold_ms=0)
+    state = {"approval_round": 1}
+
+    def rerun():
+        state["approval_round"] += 1
+        return busy()
+
+    assert profiler.run(rerun, lambda: {"session": "abc", "phase": "resume request", **state}) == busy()
+
+    reruns = profiler.recent_reruns()
+    assert len(reruns) == 1
+    assert reruns[0]["approval_round"] == 2
+    assert reruns[0]["phase"] == "resume request"
+
+
+def test_profile_is_kept_when_the_rerun_raises(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), threshold_ms=0)
+
+    def rerun():
+        raise RuntimeError("rerun")
+
+    try:
+        profiler.run(rerun, lambda: {"session": "abc", "phase": "chat"})
+    except RuntimeError:
+        pass
+
+    assert len(profiler.recent_reruns()) == 1
+
+
+def test_fast_rerun_is_discarded(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), threshold_ms=60000)
+
+    profiler.run(busy, lambda: {"session": "abc", "phase": "chat"})
+
+    assert profiler.recent_reruns() == []
+    assert profiler.hot_functions() == []
+
+
+def test_old_profiles_are_rotated(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), threshold_ms=0, max_files=2)
+
+    for _ in range(4):
+        profiler.run(busy, lambda: {"session": "abc", "phase": "chat"})
+
+    assert len(list(tmp_path.glob("*.prof"))) == 2
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_hot_functions_skip_corrupt_profiles(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), threshold_ms=0)
+    profiler.run(busy, lambda: {"session": "abc", "phase": "chat"})
+    (tmp_path / "99999999-999999-999999_truncated_chat.prof").write_bytes(b"\x00garbage")
+
+    functions = profiler.hot_functions()
+
+    assert functions
+    assert any("busy" in row["function"] or "genexpr" in row["function"] for row in functions)
+
+
+def test_concurrent_rerun_runs_unprofiled(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), threshold_ms=0)
+
+    with Profiler._profile_lock:
+        assert profiler.run(busy, lambda: {"session": "abc", "phase": "chat"}) == busy()
+
+    assert profiler.recent_reruns() == []
+
+
+def test_rerun_runs_unprofiled_when_another_profiler_is_active(tmp_path, monkeypatch):
+    class ActiveProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(Profiler.cProfile, "Profile", ActiveProfile)
+    profiler = RerunProfiler(str(tmp_path), threshold_ms=0)
+
+    assert profiler.run(busy, lambda: {"session": "abc", "phase": "chat"}) == busy()
+    assert profiler.recent_reruns() == []
+    assert not Profiler._profile_lock.locked()